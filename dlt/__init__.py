@@ -1,38 +1,44 @@
 # Copyright (C) 2015. BMW Car IT GmbH. All rights reserved.
 """DLT support module"""
 
-import collections
 import logging
 import subprocess
-
-if not hasattr(subprocess, "TimeoutExpired"):
-    import subprocess32 as subprocess  # pylint: disable=import-error
+from typing import NamedTuple
 
 
 LOGGER = logging.getLogger(__name__)
-ProcessResult = collections.namedtuple("ProcessResult", ("stdout", "stderr", "returncode"))
 
 
-def run_command(command, timeout=60, shell=True):
+class ProcessResult(NamedTuple):
+    """Result of run_command, compatible with subprocess.CompletedProcess attribute access"""
+
+    stdout: str
+    stderr: str
+    returncode: int
+
+
+def run_command(command, timeout=60, shell=None):
     """Run command in a shell and return stdout, stderr and return code
 
     :param str|list command: a command to run
     :param int timeout: timeout for the command
-    :param bool shell: shell switch
+    :param bool|None shell: shell switch, by default a str command is run in a shell and a list is executed directly
     :returns: process result
     :rtype: subprocess compatible ProcessResult
     :raises RuntimeError: If timeout expires.
     """
-    process = subprocess.Popen(
-        command, shell=shell, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-    )
+    if shell is None:
+        shell = isinstance(command, str)
     try:
-        stdout, stderr = process.communicate(timeout=timeout)
+        result = subprocess.run(
+            command,
+            shell=shell,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            timeout=timeout,
+            encoding="utf-8",
+            check=False,
+        )
     except subprocess.TimeoutExpired:
-        process.terminate()
         raise RuntimeError("Timeout %d seconds reached for command '%s'" % (timeout, command))
-    if isinstance(stdout, bytes):
-        stdout = stdout.decode("utf-8")
-    if isinstance(stderr, bytes):
-        stderr = stderr.decode("utf-8")
-    return ProcessResult(stdout, stderr, process.returncode)
+    return ProcessResult(stdout=result.stdout, stderr=result.stderr, returncode=result.returncode)
@@ -1,54 +1,145 @@
 # Copyright (C) 2017. BMW Car IT GmbH. All rights reserved.
 """Basic ctypes binding to the DLT library"""
 import ctypes
-import os
+import importlib
+import importlib.util
 
 from dlt.core.core_base import *  # noqa: F403
 
 
 API_VER = None
 
+# version -> (name of the api specific module file, full name of the api specific module)
+_API_FILE_CACHE = {}
+
+_VERSION_BUF_SIZE = 255
+_VERSION_BUF_T = ctypes.c_char * _VERSION_BUF_SIZE
+
 
 def get_version(loaded_lib):
     """Return the API version of the loaded libdlt.so library"""
     global API_VER  # pylint: disable=global-statement
-    if API_VER is None:
-        buf = ctypes.create_string_buffer(255)
-        loaded_lib.dlt_get_version(ctypes.byref(buf), 255)
-        # buf would be something like:
-        # DLT Package Version: X.XX.X STABLE, Package Revision: vX.XX.XX build on Jul XX XXXX XX:XX:XX
-        # -SYSTEMD -SYSTEMD_WATCHDOG -TEST -SHM
-        buf_split = buf.value.decode().split()
+    if API_VER is not None:
+        return API_VER
 
-        API_VER = buf_split[3]
+    buf = _VERSION_BUF_T()
+    loaded_lib.dlt_get_version(buf, _VERSION_BUF_SIZE)
+    # buf would be something like:
+    # DLT Package Version: X.XX.X STABLE, Package Revision: vX.XX.XX build on Jul XX XXXX XX:XX:XX
+    # -SYSTEMD -SYSTEMD_WATCHDOG -TEST -SHM
+    # - only the fourth token is of interest, stop splitting after it
+    buf_split = buf.value.decode("ascii", "replace").split(None, 4)
+
+    API_VER = buf_split[3]
 
     return API_VER
 
 
-def get_api_specific_file(version):
-    """Return specific version api filename, if not found fallback to first major version release"""
-    version_tuple = [int(num) for num in version.split(".")]
-    name = "core_{}.py".format("".join((str(num) for num in version_tuple)))
-    if os.path.exists(os.path.join(os.path.dirname(os.path.abspath(__file__)), name)):
-        return name
+def _parse_version(version):
+    """Return the version string as a tuple of ints, e.g. "2.18.10" -> (2, 18, 10)"""
+    return tuple(int(num) for num in version.split("."))
+
+
+def _api_module_name(version_tuple):
+    """Return the full name of the api specific module, e.g. (2, 18, 5) -> "dlt.core.core_2185"""
+    return "{}.core_{}".format(__name__, "".join(str(num) for num in version_tuple))
+
+
+def _find_api_specific_module(version):
+    """Return the (filename, module name) of the specific version api, fallback to first major version release
+
+    :param str|tuple version: The version string or the already parsed version tuple
+    """
+    cached = _API_FILE_CACHE.get(version)
+    if cached:
+        return cached
+
+    version_tuple = list(_parse_version(version) if isinstance(version, str) else version)
+    module_name = _api_module_name(version_tuple)
 
     # The minor version does not exist, try to truncate
-    if version_tuple[-1] != 0:
+    if importlib.util.find_spec(module_name) is None and version_tuple[-1] != 0:
         version_tuple = version_tuple[:-1] + [0]
-        name = "core_{}.py".format("".join((str(num) for num in version_tuple)))
-        if not os.path.exists(os.path.join(os.path.dirname(os.path.abspath(__file__)), name)):
-            raise ImportError("No module file: {}".format(name))
+        module_name = _api_module_name(version_tuple)
+        if importlib.util.find_spec(module_name) is None:
+            raise ImportError("No module file: {}.py".format(module_name.rpartition(".")[2]))
+
+    result = _API_FILE_CACHE[version] = ("{}.py".format(module_name.rpartition(".")[2]), module_name)
+    return result
 
-    return name
 
+def get_api_specific_file(version):
+    """Return specific version api filename, if not found fallback to first major version release
 
-def check_libdlt_version(api_ver):
+    :param str|tuple version: The version string or the already parsed version tuple
+    """
+    return _find_api_specific_module(version)[0]
+
+
+def get_api_specific_module(version):
+    """Return the full name of the specific version api module, e.g. "dlt.core.core_2188"
+
+    :param str|tuple version: The version string or the already parsed version tuple
+    """
+    return _find_api_specific_module(version)[1]
+
+
+def _declare_signatures(loaded_lib, api_ver_info):
+    """Declare the prototypes of the libdlt functions used by the bindings
+
+    ctypes skips guessing the conversion of each argument for functions with declared argtypes. The prototypes are
+    set on the function objects of the shared library, so they are declared in this one place for the loaded version.
+
+    :param tuple api_ver_info: The parsed libdlt version, e.g. (2, 18, 10)
+    """
+    loaded_lib.dlt_get_version.argtypes = [ctypes.POINTER(ctypes.c_char), ctypes.c_size_t]
+    loaded_lib.dlt_get_version.restype = None
+
+    for func, struct in (
+        (loaded_lib.dlt_message_init, cDLTMessage),  # noqa: F405
+        (loaded_lib.dlt_message_free, cDLTMessage),  # noqa: F405
+        (loaded_lib.dlt_filter_init, cDLTFilter),  # noqa: F405
+        (loaded_lib.dlt_filter_free, cDLTFilter),  # noqa: F405
+        (loaded_lib.dlt_client_init, cDltClient),  # noqa: F405
+        (loaded_lib.dlt_client_cleanup, cDltClient),  # noqa: F405
+    ):
+        func.argtypes = [ctypes.POINTER(struct), ctypes.c_int]
+        func.restype = ctypes.c_int
+
+    loaded_lib.dlt_message_payload.argtypes = [
+        ctypes.POINTER(cDLTMessage),  # noqa: F405
+        ctypes.POINTER(ctypes.c_char),
+        ctypes.c_size_t,
+        ctypes.c_int,
+        ctypes.c_int,
+    ]
+    loaded_lib.dlt_message_payload.restype = ctypes.c_int
+
+    filter_add_args = [ctypes.POINTER(cDLTFilter), ctypes.c_char_p, ctypes.c_char_p]  # noqa: F405
+    if api_ver_info >= (2, 18, 8):
+        # log_level, payload_min and payload_max were added to the filters in v2.18.8
+        filter_add_args += [ctypes.c_uint8, ctypes.c_int32, ctypes.c_int32]
+    loaded_lib.dlt_filter_add.argtypes = filter_add_args + [ctypes.c_int]
+    loaded_lib.dlt_filter_add.restype = ctypes.c_int
+
+    # the results of these calls are never checked, so ctypes does not need to convert them
+    for func in (
+        loaded_lib.dlt_set_storageheader,
+        loaded_lib.dlt_file_set_filter,
+        loaded_lib.dlt_file_message,
+        loaded_lib.dlt_client_register_message_callback,
+    ):
+        func.restype = None
+
+
+def check_libdlt_version(api_ver_info):
     """Check the version compatibility.
 
     python-dlt now only supports to run libdlt 2.18.5 or above.
+
+    :param tuple api_ver_info: The parsed libdlt version, e.g. (2, 18, 10)
     """
-    ver_info = tuple(int(num) for num in api_ver.split("."))
-    if ver_info < (2, 18, 5):
+    if api_ver_info < (2, 18, 5):
         raise ImportError(
             "python-dlt only supports libdlt \
         v2.18.5 (33fbad18c814e13bd7ba2053525d8959fee437d1) or above"
@@ -56,7 +147,8 @@ def check_libdlt_version(api_ver):
 
 
 API_VER = get_version(dltlib)  # noqa: F405
-check_libdlt_version(API_VER)
+API_VER_INFO = _parse_version(API_VER)
+check_libdlt_version(API_VER_INFO)
 
 # Load version specific definitions, if such a file exists, possibly
 # overriding above definitions
@@ -72,6 +164,14 @@ check_libdlt_version(API_VER)
 # This allows the implementation below to import just one final module
 # (as opposed to loading multiple implementations in a specific order)
 # to provide new/overriding implementations.
-api_specific_file = get_api_specific_file(API_VER)
-overrides = __import__("dlt.core.{}".format(api_specific_file[:-3]), globals(), locals(), ["*"])
-locals().update(overrides.__dict__)
+#
+# The overrides are applied eagerly: most of the overridden names (e.g.
+# cDltClient) already exist from core_base, so a lazy module __getattr__
+# would never be consulted for them. Module dunders (__name__, __spec__,
+# ...) are skipped so that dlt.core keeps its own identity.
+api_specific_file = get_api_specific_file(API_VER_INFO)
+overrides = importlib.import_module(get_api_specific_module(API_VER_INFO))
+globals().update({name: value for name, value in vars(overrides).items() if not name.startswith("__")})
+
+# - cDLTFilter and cDltClient are version specific, declare the prototypes after loading the overrides
+_declare_signatures(dltlib, API_VER_INFO)  # noqa: F405
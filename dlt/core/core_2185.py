@@ -2,6 +2,8 @@
 """v2.18.5 specific class definitions"""
 import ctypes
 
+from dlt.core.core_base import sockaddr_in
+
 # DltClientMode from dlt_client.h
 DLT_CLIENT_MODE_UNDEFINED = -1
 DLT_CLIENT_MODE_TCP = 0
@@ -17,17 +19,6 @@ DLT_RECEIVE_UDP_SOCKET = 1
 DLT_RECEIVE_FD = 2
 
 
-class sockaddr_in(ctypes.Structure):  # pylint: disable=invalid-name
-    """Auxiliary definition for cDltReceiver. Defined in netinet/in.h header"""
-
-    _fields_ = [
-        ("sa_family", ctypes.c_ushort),  # sin_family
-        ("sin_port", ctypes.c_ushort),
-        ("sin_addr", ctypes.c_byte * 4),
-        ("__pad", ctypes.c_byte * 8),
-    ]  # struct sockaddr_in is 16
-
-
 class cDltReceiver(ctypes.Structure):  # pylint: disable=invalid-name
     """The structure is used to organise the receiving of data including buffer handling.
     This structure is used by the corresponding functions.
@@ -46,6 +37,7 @@ class cDltReceiver(ctypes.Structure):  # pylint: disable=invalid-name
     } DltReceiver;
     """
 
+    __slots__ = ()
     _fields_ = [
         ("lastBytesRcvd", ctypes.c_int32),
         ("bytesRcvd", ctypes.c_int32),
@@ -76,6 +68,7 @@ class cDltClient(ctypes.Structure):  # pylint: disable=invalid-name
     } DltClient;
     """
 
+    __slots__ = ()
     _fields_ = [
         ("receiver", cDltReceiver),
         ("sock", ctypes.c_int),
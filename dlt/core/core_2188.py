@@ -3,7 +3,7 @@
 import ctypes
 import logging
 
-from dlt.core.core_base import dltlib
+from dlt.core.core_base import _as_bytes, dltlib, sockaddr_in
 
 # DltClientMode from dlt_client.h
 DLT_CLIENT_MODE_UNDEFINED = -1
@@ -20,6 +20,9 @@ DLT_ID_SIZE = 4
 DLT_FILTER_MAX = 30  # Maximum number of filters
 DLT_RETURN_ERROR = -1
 
+# Default upper border for the payload size of a filter: (uint32_t)-1 / 2
+PAYLOAD_MAX_DEFAULT = 0x7FFFFFFF
+
 # Return value for DLTFilter.add() - exceeded maximum number of filters
 MAX_FILTER_REACHED = 1
 # Return value for DLTFilter.add() - specified filter already exists
@@ -28,17 +31,6 @@ REPEATED_FILTER = 2
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
 
-class sockaddr_in(ctypes.Structure):  # pylint: disable=invalid-name
-    """Auxiliary definition for cDltReceiver. Defined in netinet/in.h header"""
-
-    _fields_ = [
-        ("sa_family", ctypes.c_ushort),  # sin_family
-        ("sin_port", ctypes.c_ushort),
-        ("sin_addr", ctypes.c_byte * 4),
-        ("__pad", ctypes.c_byte * 8),
-    ]  # struct sockaddr_in is 16
-
-
 class cDltReceiver(ctypes.Structure):  # pylint: disable=invalid-name
     """The structure is used to organise the receiving of data including buffer handling.
     This structure is used by the corresponding functions.
@@ -58,6 +50,7 @@ class cDltReceiver(ctypes.Structure):  # pylint: disable=invalid-name
     } DltReceiver;
     """
 
+    __slots__ = ()
     _fields_ = [
         ("lastBytesRcvd", ctypes.c_int32),
         ("bytesRcvd", ctypes.c_int32),
@@ -91,6 +84,7 @@ class cDltClient(ctypes.Structure):  # pylint: disable=invalid-name
     } DltClient;
     """
 
+    __slots__ = ()
     _fields_ = [
         ("receiver", cDltReceiver),
         ("sock", ctypes.c_int),
@@ -120,6 +114,7 @@ class cDLTFilter(ctypes.Structure):  # pylint: disable=invalid-name
     } DltFilter;
     """
 
+    __slots__ = ()
     _fields_ = [
         ("apid", (ctypes.c_char * DLT_ID_SIZE) * DLT_FILTER_MAX),
         ("ctid", (ctypes.c_char * DLT_ID_SIZE) * DLT_FILTER_MAX),
@@ -130,21 +125,20 @@ class cDLTFilter(ctypes.Structure):  # pylint: disable=invalid-name
     ]
 
     # pylint: disable=too-many-arguments
-    def add(self, apid, ctid, log_level=0, payload_min=0, payload_max=ctypes.c_uint32(-1).value // 2):
+    def add(self, apid, ctid, log_level=0, payload_min=0, payload_max=PAYLOAD_MAX_DEFAULT):
         """Add new filter pair"""
-        if isinstance(apid, str):
-            apid = bytes(apid, "ascii")
-        if isinstance(ctid, str):
-            ctid = bytes(ctid, "ascii")
-        if (
-            dltlib.dlt_filter_add(
-                ctypes.byref(self), apid or b"", ctid or b"", log_level, payload_min, payload_max, self.verbose
-            )
-            == DLT_RETURN_ERROR
-        ):
+        apid = _as_bytes(apid)
+        ctid = _as_bytes(ctid)
+        # - the declared argtypes pass self by reference, no ctypes.byref() needed
+        if _dlt_filter_add(self, apid, ctid, log_level, payload_min, payload_max, self.verbose) == DLT_RETURN_ERROR:
             if self.counter >= DLT_FILTER_MAX:
                 logger.error("Maximum number (%d) of allowed filters reached, ignoring filter!\n", DLT_FILTER_MAX)
                 return MAX_FILTER_REACHED
             logger.debug("Filter ('%s', '%s') already exists", apid, ctid)
             return REPEATED_FILTER
         return 0
+
+
+# - bound once, add() skips the attribute lookup on dltlib. The prototype depends on the libdlt version, it is
+# declared by dlt.core._declare_signatures()
+_dlt_filter_add = dltlib.dlt_filter_add
@@ -2,7 +2,11 @@
 """Default implementation of the ctypes bindings for the DLT library"""
 import ctypes
 import logging
+import struct
 import sys
+import threading
+
+from dlt.helpers import cached_property
 
 if sys.platform.startswith("darwin"):
     dltlib = ctypes.cdll.LoadLibrary("libdlt.dylib")
@@ -21,6 +25,7 @@ REPEATED_FILTER = 2
 DLT_ID_SIZE = 4
 DLT_FILTER_MAX = 30  # Maximum number of filters
 DLT_HTYP_UEH = 0x01  # use extended header
+DLT_HTYP_MSBF = 0x02  # MSB first, payload is big endian
 DLT_HTYP_WEID = 0x04  # with ECU ID
 DLT_HTYP_WSID = 0x08  # with Session ID
 DLT_HTYP_WTMS = 0x10  # with timestamp
@@ -102,10 +107,12 @@ DLT_TYLE_128BIT = 0x00000005
 
 DLT_DAEMON_TCP_PORT = 3490
 DLT_CLIENT_RCVBUFSIZE = 10024  # Size of client receive buffer from dlt_client_cfg.h
+DLT_RECEIVE_BUFSIZE = 65535  # Size of receive buffer from dlt_common.h, used by dlt_client_connect()
 
 # dlt-viever/qdltbase.cpp
-qDltMessageType = [b"log", b"app_trace", b"nw_trace", b"control", b"", b"", b"", b""]
-qDltLogInfo = [
+# the tables cover every value of the masked msin bits: 3 bits of message type, 4 bits of subtype
+qDltMessageType = (b"log", b"app_trace", b"nw_trace", b"control", b"", b"", b"", b"")
+qDltLogInfo = (
     b"",
     b"fatal",
     b"error",
@@ -122,8 +129,8 @@ qDltLogInfo = [
     b"",
     b"",
     b"",
-]
-qDltTraceType = [
+)
+qDltTraceType = (
     b"",
     b"variable",
     b"func_in",
@@ -140,12 +147,12 @@ qDltTraceType = [
     b"",
     b"",
     b"",
-]
-qDltNwTraceType = [b"", b"ipc", b"can", b"flexray", b"most", b"vfb", b"", b"", b"", b"", b"", b"", b"", b"", b"", b""]
-qDltControlType = [b"", b"request", b"response", b"time", b"", b"", b"", b"", b"", b"", b"", b"", b"", b"", b"", b""]
-cqDltMode = [b"non-verbose", b"verbose"]
-qDltEndianness = [b"little-endian", b"big-endian"]
-cqDltTypeInfo = [
+)
+qDltNwTraceType = (b"", b"ipc", b"can", b"flexray", b"most", b"vfb", b"", b"", b"", b"", b"", b"", b"", b"", b"", b"")
+qDltControlType = (b"", b"request", b"response", b"time", b"", b"", b"", b"", b"", b"", b"", b"", b"", b"", b"", b"")
+cqDltMode = (b"non-verbose", b"verbose")
+qDltEndianness = (b"little-endian", b"big-endian")
+cqDltTypeInfo = (
     b"String",
     b"Bool",
     b"SignedInteger",
@@ -154,8 +161,8 @@ cqDltTypeInfo = [
     b"RawData",
     b"TraceInfo",
     b"Utf8String",
-]
-qDltCtrlServiceId = [
+)
+qDltCtrlServiceId = (
     b"",
     b"set_log_level",
     b"set_trace_status",
@@ -177,8 +184,54 @@ qDltCtrlServiceId = [
     b"set_default_trace_status",
     b"get_software_version",
     b"message_buffer_overflow",
-]
-qDltCtrlReturnType = [b"ok", b"not_supported", b"error", b"3", b"4", b"5", b"6", b"7", b"no_matching_context_id"]
+)
+qDltCtrlReturnType = (b"ok", b"not_supported", b"error", b"3", b"4", b"5", b"6", b"7", b"no_matching_context_id")
+# names of the service ids beyond the range of qDltCtrlServiceId
+qDltCtrlServiceIdExtended = {
+    DLT_SERVICE_ID_UNREGISTER_CONTEXT: b"unregister_context",
+    DLT_SERVICE_ID_CONNECTION_INFO: b"connection_info",
+    DLT_SERVICE_ID_TIMEZONE: b"timezone",
+    DLT_SERVICE_ID_MARKER: b"marker",
+}
+# subtype names by message type
+qDltMessageSubtype = {
+    DLT_TYPE_LOG: qDltLogInfo,
+    DLT_TYPE_APP_TRACE: qDltTraceType,
+    DLT_TYPE_NW_TRACE: qDltNwTraceType,
+    DLT_TYPE_CONTROL: qDltControlType,
+}
+
+# message/service ids are stored in the payload byte order given by DLT_HTYP_MSBF
+_unpack_uint32_le = struct.Struct("<I").unpack_from
+_unpack_uint32_be = struct.Struct(">I").unpack_from
+
+# scratch buffer for dlt_message_payload, allocated once per thread instead of once per decoded message
+_payload_scratch = threading.local()
+
+
+def _message_payload_text(msg):
+    """Return the ascii payload text of the message as printed by dlt_message_payload"""
+    buf = getattr(_payload_scratch, "buf", None)
+    if buf is None:
+        buf = _payload_scratch.buf = (ctypes.c_char * DLT_DAEMON_TEXTSIZE)()
+    buf[0] = b"\000"
+    dltlib.dlt_message_payload(ctypes.byref(msg), buf, DLT_DAEMON_TEXTSIZE, DLT_OUTPUT_ASCII, msg.verbose)
+    return buf.value
+
+
+def _payload_tail(msg, offset, maxlen=None):
+    """Return up to maxlen payload bytes from offset on, without trailing NULs, copying only that range"""
+    size = msg.datasize - offset
+    if maxlen is not None:
+        size = min(size, maxlen)
+    if size <= 0:
+        return b""
+    return ctypes.string_at(ctypes.addressof(msg.databuffer.contents) + offset, size).rstrip(b"\000")
+
+
+def _as_bytes(value):
+    """Return the ascii encoded str or the given bytes, None is returned as empty bytes"""
+    return value.encode("ascii") if type(value) is str else (value or b"")  # pylint: disable=unidiomatic-typecheck
 
 
 class cDltServiceConnectionInfo(ctypes.Structure):
@@ -201,12 +254,36 @@ class cDltServiceConnectionInfo(ctypes.Structure):
     _pack_ = 1
 
 
+_CONNECTION_STATE_TEXT = {
+    DLT_CONNECTION_STATUS_DISCONNECTED: b"disconnected",
+    DLT_CONNECTION_STATUS_CONNECTED: b"connected",
+}
+
+
+def _connection_info_text(msg):
+    """Return the connection state and communication interface of a connection info response"""
+    if msg.datasize != ctypes.sizeof(cDltServiceConnectionInfo):
+        return _payload_tail(msg, 5, 256)
+    conn_info = cDltServiceConnectionInfo.from_address(ctypes.addressof(msg.databuffer.contents))
+    state = _CONNECTION_STATE_TEXT.get(conn_info.state, b"unknown")
+    return state + b" " + ctypes.string_at(conn_info.comid, DLT_ID_SIZE).rstrip(b"\000")
+
+
+# payload text of the control responses, following the "[service_id return_type] " prefix, by service id.
+# The responses of other services are printed by dlt_message_payload
+_CTRL_RESPONSE_TEXT = {
+    DLT_SERVICE_ID_GET_SOFTWARE_VERSION: lambda msg: _payload_tail(msg, 9),
+    DLT_SERVICE_ID_CONNECTION_INFO: _connection_info_text,
+    DLT_SERVICE_ID_TIMEZONE: lambda msg: _payload_tail(msg, 5, 256),
+}
+
+
 class MessageMode(object):
     """Default properties for the DLTMessage"""
 
     # pylint: disable=no-member
 
-    @property
+    @cached_property
     def use_extended_header(self):
         """Returns True if the DLTMessage has extended header"""
         return self.standardheader.htyp & DLT_HTYP_UEH
@@ -215,7 +292,7 @@ class MessageMode(object):
     def _is_extended_header_exists(self):
         return self.extendedheader and self.extendedheader.msin
 
-    @property
+    @cached_property
     def is_mode_verbose(self):
         """Returns True if the DLTMessage is set to verbose mode"""
         if not self._is_extended_header_exists:
@@ -235,65 +312,68 @@ class MessageMode(object):
     @property
     def is_type_control(self):
         """Returns True if the DLTMessage type is control"""
-        return self.standardheader.htyp & DLT_TYPE_CONTROL
+        return self.type == DLT_TYPE_CONTROL
 
     @property
     def is_type_control_response(self):
         """Returns True if the DLTMessage type is control response"""
-        return self.standardheader.htyp & DLT_MSIN_CONTROL_RESPONSE
+        return self.type == DLT_TYPE_CONTROL and self.subtype == DLT_CONTROL_RESPONSE
 
-    @property
+    @cached_property
+    def _payload_head(self):
+        """Returns the first bytes of the payload, holding the message/service ID and the ctrl return type"""
+        return ctypes.string_at(self.databuffer, min(self.datasize, 8)) if self.datasize > 0 else b""
+
+    @cached_property
+    def _payload_id(self):
+        """Returns the first uint32 of the payload, which is the message ID or the service ID"""
+        unpack = _unpack_uint32_be if self.standardheader.htyp & DLT_HTYP_MSBF else _unpack_uint32_le
+        return unpack(self._payload_head)[0]
+
+    @cached_property
     def message_id(self):
         """Returns message ID of the DLTMessage"""
         if self.is_mode_non_verbose and (self.datasize >= 4):
-            ptr_int = ctypes.cast(self.databuffer, ctypes.POINTER(ctypes.c_uint32))
-            mid = ptr_int[0]
-            return mid
+            return self._payload_id
         return 0
 
     @property
     def message_id_string(self):
         """Returns string representation of message ID"""
         mid = self.message_id
-        return qDltCtrlServiceId[mid] if 0 <= mid <= len(qDltCtrlServiceId) else b""
+        return qDltCtrlServiceId[mid] if mid < len(qDltCtrlServiceId) else b""
 
-    @property
+    @cached_property
     def ctrl_service_id(self):
         """Returns service ID of the DLTMessage"""
         service_id = 0
         if self.is_type_control and self.datasize >= 4:
-            ptr_int = ctypes.cast(self.databuffer, ctypes.POINTER(ctypes.c_uint32))
-            service_id = ptr_int[0]
+            service_id = self._payload_id
         return service_id
 
     @property
     def ctrl_service_id_string(self):
         """Returns string representation of service ID"""
         sid = self.ctrl_service_id
-        if sid == DLT_SERVICE_ID_UNREGISTER_CONTEXT:
-            return b"unregister_context"
-        if sid == DLT_SERVICE_ID_CONNECTION_INFO:
-            return b"connection_info"
-        if sid == DLT_SERVICE_ID_TIMEZONE:
-            return b"timezone"
-        if sid == DLT_SERVICE_ID_MARKER:
-            return b"marker"
-        return qDltCtrlServiceId[sid] if sid <= 20 else b""
+        if sid <= 20:
+            return qDltCtrlServiceId[sid]
+        return qDltCtrlServiceIdExtended.get(sid, b"")
 
-    @property
+    @cached_property
     def ctrl_return_type(self):
         """Returns ctrl type of the DLTMessage"""
         return_type = 0
-        if self.is_type_control and (self.is_type_control_response and self.datasize >= 6):
-            return_type = self.databuffer[4]
+        if self.is_type_control_response and self.datasize >= 6:
+            return_type = self._payload_head[4]
         return return_type
 
     @property
     def ctrl_return_type_string(self):
         """Returns string representation of ctrl type"""
-        return qDltCtrlReturnType[self.ctrl_return_type] if self.ctrl_return_type <= 8 else b""
+        return_type = self.ctrl_return_type
+        return qDltCtrlReturnType[return_type] if return_type < len(qDltCtrlReturnType) else b""
 
-    @property
+    @cached_property
     def type(self):
         """Returns message type of the DLTMessage"""
         if not self._is_extended_header_exists:
@@ -303,10 +383,9 @@ class MessageMode(object):
     @property
     def type_string(self):
         """Returns string representation of the message type"""
-        mtype = self.type
-        return qDltMessageType[mtype] if 0 <= mtype <= 7 else b""
+        return qDltMessageType[self.type]
 
-    @property
+    @cached_property
     def subtype(self):
         """Returns message subtype of the DLTMessage"""
         if not self._is_extended_header_exists:
@@ -316,19 +395,8 @@ class MessageMode(object):
     @property
     def subtype_string(self):
         """Returns string representation of the message subtype"""
-        mtype = self.type
-        msubtype = self.subtype
-
-        if mtype == DLT_TYPE_LOG:
-            return qDltLogInfo[msubtype] if 0 <= msubtype <= 7 else b""
-        if mtype == DLT_TYPE_APP_TRACE:
-            return qDltTraceType[msubtype] if 0 <= msubtype <= 7 else b""
-        if mtype == DLT_TYPE_NW_TRACE:
-            return qDltNwTraceType[msubtype] if 0 <= msubtype <= 7 else b""
-        if mtype == DLT_TYPE_CONTROL:
-            return qDltControlType[msubtype] if 0 <= msubtype <= 7 else b""
-
-        return b""
+        subtypes = qDltMessageSubtype.get(self.type)
+        return subtypes[self.subtype] if subtypes is not None else b""
 
     @property
     def payload_decoded(self):
@@ -337,52 +405,31 @@ class MessageMode(object):
         :returns: Payload data
         :rtype: str
         """
-        text = b""
-        if self.is_mode_non_verbose and not self.is_type_control and self.noar == 0:
-            buf = ctypes.create_string_buffer(b"\000" * DLT_DAEMON_TEXTSIZE)
-            dltlib.dlt_message_payload(ctypes.byref(self), buf, DLT_DAEMON_TEXTSIZE, DLT_OUTPUT_ASCII, self.verbose)
-            return b"[%s] #%s#" % (self.message_id_string, buf.value[4:].rstrip(b"\000"))
-
-        if self.type == DLT_TYPE_CONTROL and self.subtype == DLT_CONTROL_RESPONSE:
-            if self.ctrl_service_id == DLT_SERVICE_ID_MARKER:
-                return b"MARKER"
+        extendedheader = self.extendedheader
+        msin = extendedheader.msin if extendedheader else 0
+        mtype = (msin & DLT_MSIN_MSTP) >> DLT_MSIN_MSTP_SHIFT
+        verbose = msin & DLT_MSIN_VERB if msin else self.verbose
 
-            text = b"[%s %s] " % (self.ctrl_service_id_string, self.ctrl_return_type_string)
+        # verbose log and trace messages are the bulk of the traffic, none of the special cases below apply to them
+        if verbose and mtype != DLT_TYPE_CONTROL:
+            return _message_payload_text(self).rstrip(b"\000").strip()
+
+        if not verbose and mtype != DLT_TYPE_CONTROL and self.noar == 0:
+            return b"[%s] #%s#" % (self.message_id_string, _message_payload_text(self)[4:].rstrip(b"\000"))
+
+        if mtype == DLT_TYPE_CONTROL and (msin & DLT_MSIN_MTIN) >> DLT_MSIN_MTIN_SHIFT == DLT_CONTROL_RESPONSE:
             service_id = self.ctrl_service_id
+            if service_id == DLT_SERVICE_ID_MARKER:
+                return b"MARKER"
 
-            if self.ctrl_service_id == DLT_SERVICE_ID_GET_SOFTWARE_VERSION:
-                text += ctypes.string_at(self.databuffer, self.datasize)[9:].rstrip(b"\000")
-            elif self.ctrl_service_id == DLT_SERVICE_ID_CONNECTION_INFO:
-                if self.datasize == ctypes.sizeof(cDltServiceConnectionInfo):
-                    conn_info = cDltServiceConnectionInfo.from_buffer(bytearray(self.databuffer[: self.datasize]))
-                    if conn_info.state == DLT_CONNECTION_STATUS_DISCONNECTED:
-                        text += b"disconnected"
-                    elif conn_info.state == DLT_CONNECTION_STATUS_CONNECTED:
-                        text += b"connected"
-                    else:
-                        text += b"unknown"
-                    text += b" " + ctypes.string_at(conn_info.comid, DLT_ID_SIZE).rstrip(b"\000")
-                else:
-                    text += ctypes.string_at(self.databuffer, self.datasize)[5 : 256 + 5].rstrip(b"\000")
-            elif service_id == DLT_SERVICE_ID_TIMEZONE:
-                text += ctypes.string_at(self.databuffer, self.datasize)[5 : 256 + 5].rstrip(b"\000")
-            else:
-                buf = ctypes.create_string_buffer(b"\000" * DLT_DAEMON_TEXTSIZE)
-                dltlib.dlt_message_payload(
-                    ctypes.byref(self), buf, DLT_DAEMON_TEXTSIZE, DLT_OUTPUT_ASCII, self.verbose
-                )
-                text += buf.value.rstrip(b"\000")
-            return text
-
-        if self.type == DLT_TYPE_CONTROL:
-            return b"[%s] %s" % (
-                self.ctrl_service_id_string,
-                ctypes.string_at(self.databuffer, self.datasize)[4 : 256 + 4].rstrip(b"\000"),
-            )
-
-        buf = ctypes.create_string_buffer(b"\000" * DLT_DAEMON_TEXTSIZE)
-        dltlib.dlt_message_payload(ctypes.byref(self), buf, DLT_DAEMON_TEXTSIZE, DLT_OUTPUT_ASCII, self.verbose)
-        return buf.value.rstrip(b"\000").strip()
+            text_func = _CTRL_RESPONSE_TEXT.get(service_id)
+            text = text_func(self) if text_func is not None else _message_payload_text(self).rstrip(b"\000")
+            return b"[%s %s] %s" % (self.ctrl_service_id_string, self.ctrl_return_type_string, text)
+
+        if mtype == DLT_TYPE_CONTROL:
+            return b"[%s] %s" % (self.ctrl_service_id_string, _payload_tail(self, 4, 256))
+
+        return _message_payload_text(self).rstrip(b"\000").strip()
 
 
 class cDltStorageHeader(ctypes.Structure):
@@ -525,6 +572,18 @@ class cDLTMessage(ctypes.Structure):
     ]
 
 
+class sockaddr_in(ctypes.Structure):  # pylint: disable=invalid-name
+    """Auxiliary definition for cDltReceiver. Defined in netinet/in.h header"""
+
+    __slots__ = ()
+    _fields_ = [
+        ("sa_family", ctypes.c_ushort),  # sin_family
+        ("sin_port", ctypes.c_ushort),
+        ("sin_addr", ctypes.c_byte * 4),
+        ("__pad", ctypes.c_byte * 8),
+    ]  # struct sockaddr_in is 16
+
+
 class cDltReceiver(ctypes.Structure):
     """The structure is used to organise the receiving of data including buffer handling.
     This structure is used by the corresponding functions.
@@ -541,6 +600,7 @@ class cDltReceiver(ctypes.Structure):
     } DltReceiver;
     """
 
+    __slots__ = ()
     _fields_ = [
         ("lastBytesRcvd", ctypes.c_int32),
         ("bytesRcvd", ctypes.c_int32),
@@ -565,6 +625,7 @@ class cDltClient(ctypes.Structure):
     } DltClient;
     """
 
+    __slots__ = ()
     _fields_ = [
         ("receiver", cDltReceiver),
         ("sock", ctypes.c_int),
@@ -585,6 +646,7 @@ class cDLTFilter(ctypes.Structure):  # pylint: disable=invalid-name
     } DltFilter;
     """
 
+    __slots__ = ()
     _fields_ = [
         ("apid", (ctypes.c_char * DLT_ID_SIZE) * DLT_FILTER_MAX),
         ("ctid", (ctypes.c_char * DLT_ID_SIZE) * DLT_FILTER_MAX),
@@ -594,14 +656,18 @@ class cDLTFilter(ctypes.Structure):  # pylint: disable=invalid-name
     # pylint: disable=too-many-arguments
     def add(self, apid, ctid):
         """Add new filter pair"""
-        if isinstance(apid, str):
-            apid = bytes(apid, "ascii")
-        if isinstance(ctid, str):
-            ctid = bytes(ctid, "ascii")
-        if dltlib.dlt_filter_add(ctypes.byref(self), apid or b"", ctid or b"", self.verbose) == DLT_RETURN_ERROR:
+        apid = _as_bytes(apid)
+        ctid = _as_bytes(ctid)
+        # - the declared argtypes pass self by reference, no ctypes.byref() needed
+        if _dlt_filter_add(self, apid, ctid, self.verbose) == DLT_RETURN_ERROR:
             if self.counter >= DLT_FILTER_MAX:
                 logger.error("Maximum number (%d) of allowed filters reached, ignoring filter!\n", DLT_FILTER_MAX)
                 return MAX_FILTER_REACHED
             logger.debug("Filter ('%s', '%s') already exists", apid, ctid)
             return REPEATED_FILTER
         return 0
+
+
+# - bound once, add() skips the attribute lookup on dltlib. The prototype depends on the libdlt version, it is
+# declared by dlt.core._declare_signatures()
+_dlt_filter_add = dltlib.dlt_filter_add
@@ -1,8 +1,11 @@
 # Copyright (C) 2015. BMW Car IT GmbH. All rights reserved.
 """Pure Python implementation of DLT library"""
+import array
 import ctypes
+import functools
 import ipaddress as ip
 import logging
+import mmap
 import os
 import re
 import socket
@@ -35,7 +38,6 @@ from dlt.core import (
     DLT_TYPE_INFO_STRG,
     DLT_TYPE_INFO_SCOD,
     DLT_TYPE_INFO_TYLE,
-    DLT_TYPE_INFO_VARI,
     DLT_TYPE_INFO_RAWD,
     DLT_SCOD_ASCII,
     DLT_SCOD_UTF8,
@@ -45,10 +47,10 @@ from dlt.core import (
     DLT_TYLE_64BIT,
     DLT_TYLE_128BIT,
     DLT_DAEMON_TCP_PORT,
-    DLT_CLIENT_RCVBUFSIZE,
+    DLT_RECEIVE_BUFSIZE,
     DLT_RECEIVE_SOCKET,
 )
-from dlt.helpers import bytes_to_str
+from dlt.helpers import bytes_to_str, cached_property
 
 MAX_LOG_IN_ROW = 3
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
@@ -59,25 +61,84 @@ cDLT_FILE_NOT_OPEN_ERROR = "Could not open DLT Trace file (libdlt)"  # pylint: d
 DLT_UDP_MULTICAST_FD_BUFFER_SIZE = int(os.environ.get("PYDLT_UDP_MULTICAST_FD_BUFFER_SIZE", 2 * (2**20)))  # 2 Mb
 DLT_UDP_MULTICAST_BUFFER_SIZE = int(os.environ.get("PYDLT_UDP_MULTICAST_BUFFER_SIZE", 8 * (2**20)))  # 8 Mb
 
+DLT_STORAGE_HEADER_PATTERN = b"DLT\x01"
+# seconds, microseconds and ecu of the storage header, in host byte order like cDltStorageHeader
+_STORAGE_HEADER_FIELDS = struct.Struct("=4xIiI")
+# htyp, mcnt and len of the standard header, len is always big endian
+_STANDARD_HEADER_FIELDS = struct.Struct(">BBH")
+# apid and ctid of the extended header, following msin and noar
+_EXTENDED_HEADER_IDS = struct.Struct("=2xII")
+# apid and ctid as bytes
+_APID_CTID = struct.Struct("4s4s")
+# the 4 byte ecu, application and context IDs are read as integers, which are cheaper to create and to hash
+_ID_FIELD = struct.Struct("=I")
+# the timestamp of the standard header extra fields is always big endian
+_HEADER_EXTRA_TMSP = struct.Struct(">I")
+# type info and values of the payload arguments, in host byte order
+_UINT8 = struct.Struct("B")
+_UINT16 = struct.Struct("H")
+_UINT32 = struct.Struct("I")
+_UINT64 = struct.Struct("Q")
+_SINT8 = struct.Struct("b")
+_SINT16 = struct.Struct("h")
+_SINT32 = struct.Struct("i")
+_SINT64 = struct.Struct("q")
+# struct of the integer arguments by their UINT/SINT flags and type length, unsigned wins if both flags are set
+_INT_ARG_STRUCTS = {
+    flags | tyle: int_struct
+    for tyle, unsigned, signed in (
+        (DLT_TYLE_8BIT, _UINT8, _SINT8),
+        (DLT_TYLE_16BIT, _UINT16, _SINT16),
+        (DLT_TYLE_32BIT, _UINT32, _SINT32),
+        (DLT_TYLE_64BIT, _UINT64, _SINT64),
+    )
+    for flags, int_struct in (
+        (DLT_TYPE_INFO_UINT, unsigned),
+        (DLT_TYPE_INFO_UINT | DLT_TYPE_INFO_SINT, unsigned),
+        (DLT_TYPE_INFO_SINT, signed),
+    )
+}
+_INT_ARG_FLAGS = DLT_TYPE_INFO_UINT | DLT_TYPE_INFO_SINT
+_INT_ARG_KEY = _INT_ARG_FLAGS | DLT_TYPE_INFO_TYLE
+_STORAGE_HEADER_SIZE = ctypes.sizeof(cDltStorageHeader)
+# pointer types of the message headers, for the header pointers of copied messages
+_P_STORAGE_HEADER = ctypes.POINTER(cDltStorageHeader)
+_P_STANDARD_HEADER = ctypes.POINTER(cDltStandardHeader)
+_P_EXTENDED_HEADER = ctypes.POINTER(cDltExtendedHeader)
+# minimal message length (without storage header) for each htyp, i.e. the size of all headers it announces
+_MIN_MESSAGE_LEN = tuple(
+    ctypes.sizeof(cDltStandardHeader)
+    + 4 * bool(htyp & DLT_HTYP_WEID)
+    + 4 * bool(htyp & DLT_HTYP_WSID)
+    + 4 * bool(htyp & DLT_HTYP_WTMS)
+    + ctypes.sizeof(cDltExtendedHeader) * bool(htyp & DLT_HTYP_UEH)
+    for htyp in range(256)
+)
+# offsets of the timestamp and of the apid/ctid in DLT storage format data for each htyp, None if not present
+_SORT_DATA_OFFSETS = tuple(
+    (
+        (
+            ctypes.sizeof(cDltStorageHeader)
+            + ctypes.sizeof(cDltStandardHeader)
+            + 4 * bool(htyp & DLT_HTYP_WEID)
+            + 4 * bool(htyp & DLT_HTYP_WSID)
+            if htyp & DLT_HTYP_WTMS
+            else None
+        ),
+        (
+            ctypes.sizeof(cDltStorageHeader) + _MIN_MESSAGE_LEN[htyp] - ctypes.sizeof(cDltExtendedHeader) + 2
+            if htyp & DLT_HTYP_UEH
+            else None
+        ),
+    )
+    for htyp in range(256)
+)
 
-class cached_property(object):  # pylint: disable=invalid-name
-    """
-    A property that is only computed once per instance and then replaces itself
-    with an ordinary attribute. Deleting the attribute resets the property.
-    Copyright: Marcel Hellkamp <marc@gsites.de>
-    Source: https://github.com/bottlepy/bottle/commit/fa7733e075da0d790d809aa3d2f53071897e6f76
-    Licence: MIT
-    """  # noqa
-
-    def __init__(self, func):
-        self.__doc__ = getattr(func, "__doc__")
-        self.func = func
 
-    def __get__(self, obj, cls):
-        if obj is None:
-            return self
-        value = obj.__dict__[self.func.__name__] = self.func(obj)
-        return value
+@functools.lru_cache(maxsize=64)
+def _intern_cstr(value):
+    """Return the utf-8 encoded value, cached since clients reconnect to the same addresses over and over"""
+    return value.encode("utf8")
 
 
 class DLTFilter(cDLTFilter):
@@ -117,7 +178,9 @@ class Payload(object):
     def __init__(self, message):
         self._params = None
         self._noar = message.noar
-        self._buf = ctypes.string_at(message.databuffer, message.datasize)
+        # the payload is copied out of the message when it is parsed the first time, until then the reference
+        # keeps the message and its databuffer alive
+        self._message = message
 
     def __getitem__(self, index):
         """Accessing the payload item as a list"""
@@ -132,81 +195,45 @@ class Payload(object):
 
         return self._params[index]
 
-    def _parse_payload(self):  # pylint: disable=too-many-branches,too-many-statements
+    def _parse_payload(self):
         """Parse the payload into list of arguments"""
         self._params = []
+        message, self._message = self._message, None
+        buf = ctypes.string_at(message.databuffer, message.datasize)
+        append = self._params.append
 
         offset = 0
         for _ in range(self._noar):
-            type_info = struct.unpack_from("I", self._buf, offset)[0]
-            offset += struct.calcsize("I")
-
-            def get_scod(type_info):
-                """Helper function"""
-                return type_info & DLT_TYPE_INFO_SCOD
+            type_info = _UINT32.unpack_from(buf, offset)[0]
+            offset += 4
 
             value = None
             if type_info & DLT_TYPE_INFO_STRG:
-                if (get_scod(type_info) == DLT_SCOD_ASCII) or (get_scod(type_info) == DLT_SCOD_UTF8):
-                    length = struct.unpack_from("H", self._buf, offset)[0]
-                    offset += struct.calcsize("H")
-                    value = self._buf[offset : offset + length - 1]  # strip the string terminating char \x00
+                if (type_info & DLT_TYPE_INFO_SCOD) in (DLT_SCOD_ASCII, DLT_SCOD_UTF8):
+                    length = _UINT16.unpack_from(buf, offset)[0]
+                    offset += 2
+                    value = buf[offset : offset + length - 1]  # strip the string terminating char \x00
                     offset += length
 
-            elif type_info & DLT_TYPE_INFO_UINT:
-                if type_info & DLT_TYPE_INFO_VARI:
-                    pass
-
-                tyle = type_info & DLT_TYPE_INFO_TYLE
-                if tyle == DLT_TYLE_8BIT:
-                    value = struct.unpack_from("B", self._buf, offset)[0]
-                    offset += 1
-                elif tyle == DLT_TYLE_16BIT:
-                    value = struct.unpack_from("H", self._buf, offset)[0]
-                    offset += 2
-                elif tyle == DLT_TYLE_32BIT:
-                    value = struct.unpack_from("I", self._buf, offset)[0]
-                    offset += 4
-                elif tyle == DLT_TYLE_64BIT:
-                    value = struct.unpack_from("Q", self._buf, offset)[0]
-                    offset += 8
-                elif tyle == DLT_TYLE_128BIT:
-                    raise TypeError("reading 128BIT values not supported")
-
-            elif type_info & DLT_TYPE_INFO_SINT:
-                if type_info & DLT_TYPE_INFO_VARI:
-                    pass
-
-                tyle = type_info & DLT_TYPE_INFO_TYLE
-                if tyle == DLT_TYLE_8BIT:
-                    value = struct.unpack_from("b", self._buf, offset)[0]
-                    offset += 1
-                elif tyle == DLT_TYLE_16BIT:
-                    value = struct.unpack_from("h", self._buf, offset)[0]
-                    offset += 2
-                elif tyle == DLT_TYLE_32BIT:
-                    value = struct.unpack_from("i", self._buf, offset)[0]
-                    offset += 4
-                elif tyle == DLT_TYLE_64BIT:
-                    value = struct.unpack_from("q", self._buf, offset)[0]
-                    offset += 8
-                elif tyle == DLT_TYLE_128BIT:
+            elif type_info & _INT_ARG_FLAGS:
+                int_struct = _INT_ARG_STRUCTS.get(type_info & _INT_ARG_KEY)
+                if int_struct is not None:
+                    value = int_struct.unpack_from(buf, offset)[0]
+                    offset += int_struct.size
+                elif type_info & DLT_TYPE_INFO_TYLE == DLT_TYLE_128BIT:
                     raise TypeError("reading 128BIT values not supported")
 
             elif type_info & DLT_TYPE_INFO_RAWD:
-                if type_info & DLT_TYPE_INFO_VARI:
-                    pass
-
-                length = struct.unpack_from("H", self._buf, offset)[0]
-                offset += struct.calcsize("H")
+                length = _UINT16.unpack_from(buf, offset)[0]
+                offset += 2
 
-                value = self._buf[offset : offset + length]
+                value = buf[offset : offset + length]
                 offset += length
 
             else:
                 value = "ERROR"
 
-            self._params.append(value)
+            append(value)
 
     def __len__(self):
         """Return number of parsed parameters"""
@@ -244,14 +271,11 @@ class DLTMessage(cDLTMessage, MessageMode):
         This method is called by the pickle module to serialize objects
         that it cannot automatically serialize.
         """
-        # copy the data from the databuffer pointer into an array
-        databuffer = ctypes.ARRAY(ctypes.c_uint8, self.datasize)()
-        ctypes.memmove(databuffer, self.databuffer, self.datasize)
-
         init_args = (self.found_serialheader, self.resync_offset, self.headersize, self.datasize)
         state_dict = {
-            "headerbuffer": bytearray(self.headerbuffer),
-            "databuffer": bytearray(databuffer),
+            "headerbuffer": bytes(self.headerbuffer),
+            # copy the data from the databuffer pointer, bytes are pickled as they are
+            "databuffer": ctypes.string_at(self.databuffer, self.datasize),
             "databuffersize": self.databuffersize,
             "storageheader": self.storageheader,
             "standardheader": self.standardheader,
@@ -273,14 +297,10 @@ class DLTMessage(cDLTMessage, MessageMode):
         self.headerextra = state["headerextra"]
         self.p_extendedheader.contents = state["extendedheader"]
         # - populate databuffer
-        databuffer = ctypes.ARRAY(ctypes.c_uint8, self.datasize)()
-        for index, byte in enumerate(state["databuffer"]):
-            databuffer[index] = byte
-        self.databuffer = databuffer
+        self.databuffer = ctypes.ARRAY(ctypes.c_uint8, self.datasize).from_buffer_copy(state["databuffer"])
 
         # - populate headerbuffer
-        for index, byte in enumerate(state["headerbuffer"]):
-            self.headerbuffer[index] = byte
+        self.headerbuffer[:] = state["headerbuffer"]
 
         # - This is required because we are not calling
         # dlt_message_init() so we do not need to call
@@ -291,14 +311,16 @@ class DLTMessage(cDLTMessage, MessageMode):
     def from_bytes(data):
         """Create a class instance from a byte string in DLT storage format"""
         msg = DLTMessage()
-        storageheader, remainder = msg.extract_storageheader(data)
-
-        buf = ctypes.create_string_buffer(remainder)
+        storageheader = cDltStorageHeader.from_buffer_copy(data)  # pylint: disable=no-member
+        storageheader_size = ctypes.sizeof(cDltStorageHeader)
 
+        # dlt_message_read() copies the headers and payload into the message, so it can read them right behind the
+        # storage header in the given bytes instead of from a sliced off copy of the message
+        data_address = ctypes.cast(ctypes.c_char_p(data), ctypes.c_void_p).value
         dltlib.dlt_message_read(
             ctypes.byref(msg),
-            ctypes.cast(buf, ctypes.POINTER(ctypes.c_uint8)),
-            ctypes.c_uint(len(remainder)),
+            ctypes.c_void_p(data_address + storageheader_size),
+            ctypes.c_uint(len(data) - storageheader_size),
             0,  # resync
             0,
         )  # verbose
@@ -318,35 +340,29 @@ class DLTMessage(cDLTMessage, MessageMode):
     @staticmethod
     def extract_storageheader(data):
         """Split binary message data into storage header and remainder"""
-        header = data[0 : ctypes.sizeof(cDltStorageHeader)]
         # pylint: disable=no-member
-        return (cDltStorageHeader.from_buffer_copy(header), data[ctypes.sizeof(cDltStorageHeader) :])
+        return (cDltStorageHeader.from_buffer_copy(data), data[ctypes.sizeof(cDltStorageHeader) :])
 
     @staticmethod
     def extract_sort_data(data):
-        """Extract timestamp, message length, apid, ctid from a bytestring in DLT storage format (speed optimized)"""
-        htyp_data = ord(chr(data[16]))
-        len_data = data[19:17:-1]
-        len_value = ctypes.cast(len_data, ctypes.POINTER(ctypes.c_ushort)).contents.value + 16
+        """Extract timestamp, message length, apid, ctid from a bytestring in DLT storage format (speed optimized)
+
+        The data can also be a memoryview, e.g. over an mmap of a DLT file, it is only read through struct.
+        """
+        htyp_data, _, len_value = _STANDARD_HEADER_FIELDS.unpack_from(data, 16)
+        len_value += 16
         apid = b""
         ctid = b""
         tmsp_value = 0.0
 
-        bytes_offset = 0  # We know where data will be in the message, but ...
-        if not htyp_data & DLT_HTYP_WEID:  # if there is no ECU ID and/or Session ID, then it will be earlier
-            bytes_offset -= 4
-        if not htyp_data & DLT_HTYP_WSID:
-            bytes_offset -= 4
-
-        if htyp_data & DLT_HTYP_WTMS:
-            tmsp_base = 31 + bytes_offset  # Typical timestamp end offset
-            tmsp_data = data[tmsp_base : tmsp_base - 4 : -1]
-            tmsp_value = ctypes.cast(tmsp_data, ctypes.POINTER(ctypes.c_uint32)).contents.value / 10000.0
+        tmsp_offset, ids_offset = _SORT_DATA_OFFSETS[htyp_data]
+        if tmsp_offset is not None:
+            tmsp_value = _HEADER_EXTRA_TMSP.unpack_from(data, tmsp_offset)[0] / 10000.0
 
-        if htyp_data & DLT_HTYP_UEH:
-            apid_base = 38 + bytes_offset  # Typical APID end offset
-            apid = data[apid_base - 4 : apid_base].rstrip(b"\x00")
-            ctid = data[apid_base : apid_base + 4].rstrip(b"\x00")
+        if ids_offset is not None:
+            apid, ctid = _APID_CTID.unpack_from(data, ids_offset)
+            apid = apid.rstrip(b"\x00")
+            ctid = ctid.rstrip(b"\x00")
 
         apid = bytes_to_str(apid)
         ctid = bytes_to_str(ctid)
@@ -358,7 +374,7 @@ class DLTMessage(cDLTMessage, MessageMode):
             if dltlib.dlt_message_free(ctypes.byref(self), self.verbose) == DLT_RETURN_ERROR:
                 raise RuntimeError("Could not free DLTMessage")
 
-    @property
+    @cached_property
     def storageheader(self):
         """Workaround to get rid of need to call .contents"""
         try:
@@ -366,12 +382,12 @@ class DLTMessage(cDLTMessage, MessageMode):
         except ValueError:
             return None
 
-    @property
+    @cached_property
     def standardheader(self):
         """Workaround to get rid of need to call .contents"""
         return self.p_standardheader.contents
 
-    @property
+    @cached_property
     def extendedheader(self):
         """Workaround to get rid of need to call .contents"""
         try:
@@ -381,13 +397,18 @@ class DLTMessage(cDLTMessage, MessageMode):
 
     def __eq__(self, other):
         """Equal test - not comparing storage header (contains timestamps)"""
-        header1 = ctypes.string_at(self.headerbuffer, self.headersize)[ctypes.sizeof(cDltStorageHeader) :]
-        header2 = ctypes.string_at(other.headerbuffer, other.headersize)[ctypes.sizeof(cDltStorageHeader) :]
+        if self.headersize != other.headersize or self.datasize != other.datasize:
+            return False
 
-        data1 = ctypes.string_at(self.databuffer, self.datasize)
-        data2 = ctypes.string_at(other.databuffer, other.datasize)
+        # - copy only the headers behind the storage header, and the payloads only if the headers are equal
+        offset = ctypes.sizeof(cDltStorageHeader)
+        size = max(self.headersize - offset, 0)
+        header1 = ctypes.string_at(ctypes.addressof(self.headerbuffer) + offset, size)
+        header2 = ctypes.string_at(ctypes.addressof(other.headerbuffer) + offset, size)
+        if header1 != header2:
+            return False
 
-        return header1 == header2 and data1 == data2
+        return ctypes.string_at(self.databuffer, self.datasize) == ctypes.string_at(other.databuffer, other.datasize)
 
     def compare(self, other=None):  # pylint: disable=too-many-return-statements,too-many-branches
         """Compare messages by given attributes
@@ -451,6 +472,21 @@ class DLTMessage(cDLTMessage, MessageMode):
                 return False
         return True
 
+    def matches_any(self, id_pairs):
+        """Check if the application and context ID of the message are one of the given pairs
+
+        For filters with fixed IDs this is a single set lookup instead of a compare() call per filter.
+
+        :param set|frozenset id_pairs: (apid, ctid) pairs of str
+        :returns: True if the (apid, ctid) pair of the message is in id_pairs
+        :rtype: bool
+
+        Example:
+        id_pairs = frozenset([("AP1", "CT1"), ("AP2", "CT2")])
+        message.matches_any(id_pairs)
+        """
+        return (self.apid, self.ctid) in id_pairs
+
     def __str__(self):
         """Construct DLTViewer-like string"""
         out = [time.asctime(time.gmtime(self.storage_timestamp))]
@@ -559,6 +595,184 @@ class DLTMessage(cDLTMessage, MessageMode):
         return self.storageheader.seconds + self.storageheader.microseconds * 0.000001
 
 
+class DLTMessageIndex(object):
+    """Index of the messages in DLT storage format data
+
+    The index is built from the message headers only, without libdlt and without creating a DLTMessage per
+    message. Header fields are kept as columns, messages are decoded when they are accessed by index.
+    """
+
+    def __init__(self, data):
+        """Index the messages
+
+        :param data: DLT storage format data, e.g. bytes or an mmap of a DLT file
+        """
+        self.data = data
+        self.offsets = array.array("Q")
+        self.lengths = array.array("I")  # including the storage header
+        self.htyp = array.array("B")
+        self.mcnt = array.array("B")
+        self.seconds = array.array("I")
+        self.microseconds = array.array("i")
+        self.ecu = []
+        self.apid = []  # empty for messages without extended header
+        self.ctid = []
+        self.corrupt_msg_count = 0
+        self._scan()
+
+    @classmethod
+    def from_file(cls, filename):
+        """Index the messages of a DLT file
+
+        The file is mapped into memory read-only, so the page cache serves as buffer for scanning and decoding.
+
+        :param str filename: DLT log filename
+        :rtype: DLTMessageIndex
+        """
+        with open(filename, "rb") as fobj:
+            if os.fstat(fobj.fileno()).st_size == 0:
+                raise IOError(DLT_EMPTY_FILE_ERROR)
+            return cls(mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def close(self):
+        """Release the memory mapping of the indexed data, e.g. of an index created by from_file
+
+        Messages can not be decoded from the index anymore after it was closed.
+        """
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _scan(self):
+        """Walk the data message by message, resyncing on the storage header pattern like dlt_file_read"""
+        data = self.data
+        size = len(data)
+        storage_header_size = ctypes.sizeof(cDltStorageHeader)
+        header_size = storage_header_size + _STANDARD_HEADER_FIELDS.size
+        ids = {}  # the few distinct ecu, application and context ids are shared by all entries
+
+        offset = data.find(DLT_STORAGE_HEADER_PATTERN)
+        if offset > 0:
+            self.corrupt_msg_count += 1
+        while offset != -1 and offset + header_size <= size:
+            htyp, mcnt, length = _STANDARD_HEADER_FIELDS.unpack_from(data, offset + storage_header_size)
+            if length < _MIN_MESSAGE_LEN[htyp]:
+                # the message is too short for the headers it announces
+                self.corrupt_msg_count += 1
+                offset = data.find(DLT_STORAGE_HEADER_PATTERN, offset + 1)
+                continue
+
+            end = offset + storage_header_size + length
+            if end > size:
+                # the length runs past the data, either a corrupt length or an incomplete message at the end
+                self.corrupt_msg_count += 1
+                offset = data.find(DLT_STORAGE_HEADER_PATTERN, offset + 1)
+                continue
+
+            self.offsets.append(offset)
+            self.lengths.append(end - offset)
+            self.htyp.append(htyp)
+            self.mcnt.append(mcnt)
+            seconds, microseconds, ecu = _STORAGE_HEADER_FIELDS.unpack_from(data, offset)
+            self.seconds.append(seconds)
+            self.microseconds.append(microseconds)
+            if htyp & DLT_HTYP_UEH:
+                apid, ctid = _EXTENDED_HEADER_IDS.unpack_from(
+                    data, offset + storage_header_size + _MIN_MESSAGE_LEN[htyp] - ctypes.sizeof(cDltExtendedHeader)
+                )
+            else:
+                apid = ctid = 0
+            for column, value in ((self.ecu, ecu), (self.apid, apid), (self.ctid, ctid)):
+                value_id = ids.get(value)
+                if value_id is None:
+                    value_id = ids[value] = _ID_FIELD.pack(value).split(b"\000", 1)[0]
+                column.append(value_id)
+
+            offset = data.find(DLT_STORAGE_HEADER_PATTERN, end)
+            if offset > end:
+                self.corrupt_msg_count += 1
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        """Decode the message at the given index
+
+        :returns: The decoded message
+        :rtype: DLTMessage
+        :raises IndexError: If message index is out of boundary
+        """
+        offset = self.offsets[index]
+        return DLTMessage.from_bytes(self.data[offset : offset + self.lengths[index]])
+
+    def select(self, apid=None, ctid=None):
+        """Get the indexes of the messages with the given application and/or context ID
+
+        :param str|bytes apid: Application ID to match, None matches any
+        :param str|bytes ctid: Context ID to match, None matches any
+        :rtype: list
+        """
+        if isinstance(apid, str):
+            apid = apid.encode("ascii")
+        if isinstance(ctid, str):
+            ctid = ctid.encode("ascii")
+        return [
+            index
+            for index, (msg_apid, msg_ctid) in enumerate(zip(self.apid, self.ctid))
+            if (apid is None or msg_apid == apid) and (ctid is None or msg_ctid == ctid)
+        ]
+
+    def filter(self, filters):
+        """Get the indexes of the messages passing the filters, with the rules of dlt_message_filter_check
+
+        A message passes if one of the filters matches its application and context ID, an empty ID in a filter
+        matches any. Messages without extended header always pass.
+
+        :param list filters: List of filters to apply [("APPID", "CTID"), ...]
+        :rtype: list
+        """
+        filter_ids = [(self._filter_id(apid), self._filter_id(ctid)) for apid, ctid in filters]
+        if not filter_ids:
+            return list(range(len(self)))
+
+        matches = {}  # the filters are checked once per distinct pair of application and context ID
+        indexes = []
+        for index, (htyp, apid, ctid) in enumerate(zip(self.htyp, self.apid, self.ctid)):
+            if htyp & DLT_HTYP_UEH:
+                match = matches.get((apid, ctid))
+                if match is None:
+                    match = matches[(apid, ctid)] = any(
+                        (not filter_apid or filter_apid == apid) and (not filter_ctid or filter_ctid == ctid)
+                        for filter_apid, filter_ctid in filter_ids
+                    )
+                if not match:
+                    continue
+            indexes.append(index)
+        return indexes
+
+    @staticmethod
+    def _filter_id(value):
+        """Convert a filter ID to the form stored in the index, like dlt_set_id does"""
+        if not value:
+            return b""
+        if isinstance(value, str):
+            value = value.encode("ascii")
+        return value[:DLT_ID_SIZE].split(b"\000", 1)[0]
+
+    def storageheader(self, index):
+        """Get a copy of the storage header of the message at the given index
+
+        :rtype: cDltStorageHeader
+        :raises IndexError: If message index is out of boundary
+        """
+        return cDltStorageHeader.from_buffer_copy(self.data, self.offsets[index])  # pylint: disable=no-member
+
+
 class cDLTFile(ctypes.Structure):  # pylint: disable=invalid-name
     """The structure to organise the access to DLT files. This structure is used by the corresponding functions.
 
@@ -606,7 +820,9 @@ class cDLTFile(ctypes.Structure):  # pylint: disable=invalid-name
         self.verbose = kwords.pop("verbose", 0)
         self.filename = kwords.pop("filename", None)
         if isinstance(self.filename, str):
-            self.filename = bytes(self.filename, "utf-8")
+            self.filename = self.filename.encode("utf-8")
+        # seconds to wait for new data in a live run before the file is checked again
+        self.poll_interval = kwords.pop("poll_interval", 0.1)
         super(cDLTFile, self).__init__(**kwords)
         if dltlib.dlt_file_init(ctypes.byref(self), self.verbose) == DLT_RETURN_ERROR:
             raise RuntimeError("Could not initialize DLTFile")
@@ -635,20 +851,17 @@ class cDLTFile(ctypes.Structure):  # pylint: disable=invalid-name
         """Helper function for generate_index to skip over invalid storage headers.
 
         :returns: Offset to the next storage header position (after
-                  self.file_position), if it was found, or position of EOF if not
-        :rtype: int
+                  self.file_position), if it was found, or None if not
+        :rtype: int|None
         """
+        position = self.file_position  # pylint: disable=access-member-before-definition
         with open(self.filename, "rb") as fobj:
-            last_position = self.file_position  # pylint: disable=access-member-before-definition
-            fobj.seek(last_position)
-            buf = fobj.read(1024)
-            while buf:
-                found = buf.find(b"DLT\x01")
-                if found != -1:
-                    return last_position + found
-                last_position = fobj.tell()
-                buf = fobj.read(1024)
-        return None
+            if os.fstat(fobj.fileno()).st_size <= position:
+                return None
+            # - search the mapped file in one go instead of chunk by chunk, so a header can not be split between reads
+            with mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                found = data.find(DLT_STORAGE_HEADER_PATTERN, position)
+        return found if found != -1 else None
 
     # pylint: disable=attribute-defined-outside-init,access-member-before-definition
     def generate_index(self):
@@ -705,7 +918,7 @@ class cDLTFile(ctypes.Structure):  # pylint: disable=invalid-name
         self.set_filters(filters)
 
         if isinstance(filename, str):
-            filename = bytes(filename, "utf-8")
+            filename = filename.encode("utf-8")
         # read and index file
         self.filename = filename
         self.generate_index()
@@ -716,10 +929,7 @@ class cDLTFile(ctypes.Structure):  # pylint: disable=invalid-name
         if filters is not None:
             dlt_filter = DLTFilter(verbose=self.verbose)
             for apid, ctid in filters:
-                if isinstance(apid, str):
-                    apid = bytes(apid, "ascii")
-                if isinstance(ctid, str):
-                    ctid = bytes(ctid, "ascii")
+                # - add() takes care of encoding str IDs
                 dlt_filter.add(apid, ctid)
             self.filters = dlt_filter
             dltlib.dlt_file_set_filter(ctypes.byref(self), ctypes.byref(dlt_filter), self.verbose)
@@ -746,49 +956,49 @@ class cDLTFile(ctypes.Structure):  # pylint: disable=invalid-name
         dltlib.dlt_file_message(ctypes.byref(self), index, self.verbose)
         # deepcopy the object
         msg = DLTMessage.from_buffer_copy(self.msg)  # pylint: disable=no-member
-        msg.databuffer.contents = ctypes.create_string_buffer(self.msg.datasize)
-        ctypes.memmove(msg.databuffer, self.msg.databuffer, msg.datasize)
+        # - the payload is copied once into a buffer owned by msg, the buffer of self.msg is reused by libdlt
+        databuffer = (ctypes.c_uint8 * msg.datasize)()
+        ctypes.memmove(databuffer, self.msg.databuffer, msg.datasize)
+        msg.databuffer = databuffer
 
-        # set the new storage header pointer
-        offset = 0
-        hdr = cDltStorageHeader.from_address(ctypes.addressof(msg.headerbuffer) + offset)  # pylint: disable=no-member
-        msg.p_storageheader = ctypes.pointer(hdr)
-
-        # set the new standard header pointer
-        offset = ctypes.sizeof(cDltStorageHeader)
-        hdr = cDltStandardHeader.from_address(ctypes.addressof(msg.headerbuffer) + offset)  # pylint: disable=no-member
-        msg.p_standardheader = ctypes.pointer(hdr)
-        # set the new extended header pointer
+        # set the new header pointers, at the same offsets in the copied headerbuffer
+        # pylint: disable=no-member
+        base = ctypes.addressof(msg.headerbuffer)
+        msg.p_storageheader = _P_STORAGE_HEADER(cDltStorageHeader.from_address(base))
+        msg.p_standardheader = _P_STANDARD_HEADER(cDltStandardHeader.from_address(base + _STORAGE_HEADER_SIZE))
         if self.msg.use_extended_header:
             offset = ctypes.addressof(self.msg.p_extendedheader.contents) - ctypes.addressof(self.msg.headerbuffer)
-            # pylint: disable=no-member
-            hdr = cDltExtendedHeader.from_address(ctypes.addressof(msg.headerbuffer) + offset)
-            msg.p_extendedheader = ctypes.pointer(hdr)
+            msg.p_extendedheader = _P_EXTENDED_HEADER(cDltExtendedHeader.from_address(base + offset))
 
         return msg
 
     def _open_file(self):
         """Open the configured file for processing"""
         file_opened = False
+        # - retry quickly first, the file of a live run is usually created right after the reader is started
+        retry_delay = 0.05
         while not self._is_stop_reading_set():
             if dltlib.dlt_file_open(ctypes.byref(self), self.filename, self.verbose) >= DLT_RETURN_OK:
                 file_opened = True
                 break
             if not self.live_run:
                 break
-            time.sleep(0.5)
+            self.stop_reading.wait(retry_delay)
+            retry_delay = min(retry_delay * 2, 0.5)
 
         if not file_opened:
             logger.error("DLT FILE OPEN FAILED - Analysis will not be performed")
             raise IOError(cDLT_FILE_NOT_OPEN_ERROR)
 
-    def _log_message_progress(self):
-        """Logs current message for progress information"""
-        length = os.stat(self.filename).st_size
+    def _log_message_progress(self, file_size):
+        """Logs current message for progress information
+
+        :param int file_size: Size of the file when it was checked for new data last, a live file may have grown
+        """
         logger.debug(
             "Processed %s messages (%s%% of %sfile) from %s, next message is apid %s, ctid %s",
             self.position,
-            int(100 * self.file_position / length),
+            int(100 * self.file_position / max(file_size, self.file_position, 1)),
             "live " if self.live_run else "",
             self.filename,
             self.msg.apid,
@@ -809,6 +1019,9 @@ class cDLTFile(ctypes.Structure):  # pylint: disable=invalid-name
         corruption_check_try = True
 
         self._open_file()
+        # - the file structure and its message do not move, the references are valid for the whole iteration
+        file_ref = ctypes.byref(self)
+        msg_ref = ctypes.byref(self.msg)
 
         found_data = False
         while not self._is_stop_reading_set() or corruption_check_try:  # pylint: disable=too-many-nested-blocks
@@ -820,19 +1033,17 @@ class cDLTFile(ctypes.Structure):  # pylint: disable=invalid-name
                 corruption_check_try = False
 
                 while not self._is_stop_reading_set() and (
-                    dltlib.dlt_file_read(ctypes.byref(self), self.verbose) >= DLT_RETURN_OK
+                    dltlib.dlt_file_read(file_ref, self.verbose) >= DLT_RETURN_OK
                 ):
                     found_data = True
-                    if (
-                        self.filter
-                        and dltlib.dlt_message_filter_check(ctypes.byref(self.msg), self.filter, 0) != DLT_RETURN_TRUE
-                    ):
+                    # - dlt_file_read() also reads the messages that the filter of the file does not match
+                    if self.filter and dltlib.dlt_message_filter_check(msg_ref, self.filter, 0) != DLT_RETURN_TRUE:
                         continue
 
                     index = self.position
                     msg = self[index]
                     if not index % 100000:
-                        self._log_message_progress()
+                        self._log_message_progress(os_stat.st_size)
                     yield msg
 
                 if cached_file_pos != self.file_position:
@@ -857,7 +1068,10 @@ class cDLTFile(ctypes.Structure):  # pylint: disable=invalid-name
                             logger.info("End of file reached at %s", self.file_position)
                             break
 
-            time.sleep(0.1)
+            # Check again right away while there is something left to do, only a live run waits for new data.
+            # The wait returns early when the reading is stopped from a thread.
+            if self.live_run and not corruption_check_try:
+                self.stop_reading.wait(self.poll_interval)
 
         if not found_data:
             raise IOError(DLT_EMPTY_FILE_ERROR)
@@ -893,8 +1107,9 @@ class DLTClient(cDltClient):
         if "servIP" in kwords:
             serv_ip = kwords.pop("servIP")
             if isinstance(serv_ip, str):
-                serv_ip = serv_ip.encode("utf8")
-            ip_init_state = dltlib.dlt_client_set_server_ip(ctypes.byref(self), ctypes.create_string_buffer(serv_ip))
+                serv_ip = _intern_cstr(serv_ip)
+            # - libdlt copies the addresses, the bytes are passed as they are instead of copying them to a buffer
+            ip_init_state = dltlib.dlt_client_set_server_ip(ctypes.byref(self), serv_ip)
             if ip_init_state == DLT_RETURN_ERROR:
                 raise RuntimeError("Could not initialize servIP for DLTClient")
 
@@ -904,10 +1119,8 @@ class DLTClient(cDltClient):
                 if "hostIP" in kwords:
                     host_ip = kwords.pop("hostIP")
                     if isinstance(host_ip, str):
-                        host_ip = host_ip.encode("utf8")
-                    ip_init_state = dltlib.dlt_client_set_host_if_address(
-                        ctypes.byref(self), ctypes.create_string_buffer(host_ip)
-                    )
+                        host_ip = _intern_cstr(host_ip)
+                    ip_init_state = dltlib.dlt_client_set_host_if_address(ctypes.byref(self), host_ip)
                     if ip_init_state == DLT_RETURN_ERROR:
                         raise RuntimeError("Could not initialize multicast address for DLTClient")
 
@@ -967,14 +1180,17 @@ class DLTClient(cDltClient):
                         # pylint: disable=attribute-defined-outside-init
                         self.sock = ctypes.c_int(self._connected_socket.fileno())
                         # - also init the receiver to replicate
-                        # dlt_client_connect() behavior
+                        # dlt_client_connect() behavior. The buffer size
+                        # bounds how much dlt_receiver_receive() reads per
+                        # recv() call, all complete messages are then
+                        # dispatched from the buffer without further syscalls
                         if hasattr(self.receiver, "type"):
                             connected = dltlib.dlt_receiver_init(
-                                ctypes.byref(self.receiver), self.sock, DLT_RECEIVE_SOCKET, DLT_CLIENT_RCVBUFSIZE
+                                ctypes.byref(self.receiver), self.sock, DLT_RECEIVE_SOCKET, DLT_RECEIVE_BUFSIZE
                             )
                         else:
                             connected = dltlib.dlt_receiver_init(
-                                ctypes.byref(self.receiver), self.sock, DLT_CLIENT_RCVBUFSIZE
+                                ctypes.byref(self.receiver), self.sock, DLT_RECEIVE_BUFSIZE
                             )
                         break
             else:
@@ -1023,9 +1239,11 @@ class DLTClient(cDltClient):
         :rtype: DLTMessage|None
         """
         msg = DLTMessage(verbose=verbose)
+        # - the char * position in the receive buffer is passed as is, casting it to the uint8_t * of the
+        # prototype would only create another pointer object per message
         res = dltlib.dlt_message_read(
             ctypes.byref(msg),
-            ctypes.cast(self.receiver.buf, ctypes.POINTER(ctypes.c_uint8)),
+            self.receiver.buf,
             ctypes.c_uint(self.receiver.bytesRcvd),  # length
             ctypes.c_int(0),  # resync
             ctypes.c_int(verbose),
@@ -1148,6 +1366,9 @@ def py_dlt_client_main_loop(client, limit=None, verbose=0, dumpfile=None, callba
     function return value
     """
     bad_messages = 0
+    # - the receiver is part of the client structure, its address does not change while the loop runs
+    receiver = ctypes.byref(client.receiver)
+    receive_args = (receiver,) if hasattr(client.receiver, "type") else (receiver, DLT_RECEIVE_SOCKET)
     while True:
         if bad_messages > 100:
             # Some bad data is coming in and we can not recover - raise an error to cause a reconnect
@@ -1182,10 +1403,7 @@ def py_dlt_client_main_loop(client, limit=None, verbose=0, dumpfile=None, callba
         # the status of the callback (in the case of dlt_broker, this is
         # the stop_flag Event), this loop will only proceed after the
         # function has returned or terminate when an exception is raised
-        if hasattr(client.receiver, "type"):
-            recv_size = dltlib.dlt_receiver_receive(ctypes.byref(client.receiver))
-        else:
-            recv_size = dltlib.dlt_receiver_receive(ctypes.byref(client.receiver), DLT_RECEIVE_SOCKET)
+        recv_size = dltlib.dlt_receiver_receive(*receive_args)
         if recv_size <= 0:
             logger.error("Error while reading from socket")
             return False
@@ -1208,11 +1426,11 @@ def py_dlt_client_main_loop(client, limit=None, verbose=0, dumpfile=None, callba
                 dumpfile.write(msg.to_bytes())
 
             # remove message from receiver buffer
-            size = msg.headersize + msg.datasize - ctypes.sizeof(cDltStorageHeader)
+            size = msg.headersize + msg.datasize - _STORAGE_HEADER_SIZE
             if msg.found_serialheader:
                 size += DLT_ID_SIZE
 
-            if dltlib.dlt_receiver_remove(ctypes.byref(client.receiver), size) < 0:
+            if dltlib.dlt_receiver_remove(receiver, size) < 0:
                 logger.error("dlt_receiver_remove failed")
                 return False
 
@@ -1232,7 +1450,7 @@ def py_dlt_client_main_loop(client, limit=None, verbose=0, dumpfile=None, callba
         else:
             # - failed to read a complete message, rewind the client
             # receiver buffer pointer to start of the buffer
-            if dltlib.dlt_receiver_move_to_begin(ctypes.byref(client.receiver)) == DLT_RETURN_ERROR:
+            if dltlib.dlt_receiver_move_to_begin(receiver) == DLT_RETURN_ERROR:
                 logger.error("dlt_receiver_move_to_begin failed")
                 return False
 
@@ -129,14 +129,17 @@ class DLTBroker(object):
     def start(self):
         """DLTBroker main worker method"""
         if isinstance(self.msg_handler, DLTMessageHandler):
-            logger.debug(
-                "Starting DLTBroker with parameters: use_proxy=%s, ip_address=%s, port=%s, filename=%s, multicast=%s",
-                False,
-                self._ip_address,
-                self._port,
-                self._filename,
-                ip.ip_address(self._ip_address).is_multicast,
-            )
+            # - the address is only parsed for the log message, skip it when the message is not logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Starting DLTBroker with parameters: use_proxy=%s, ip_address=%s, port=%s, filename=%s, "
+                    "multicast=%s",
+                    False,
+                    self._ip_address,
+                    self._port,
+                    self._filename,
+                    ip.ip_address(self._ip_address).is_multicast,
+                )
         else:
             logger.debug("Starting DLTBroker by reading %s", self._filename)
 
@@ -163,16 +166,14 @@ class DLTBroker(object):
                 return False
 
             return True
-        except tqueue.Empty as err:
+        except tqueue.Empty:
             if self.ignore_filter_set_ack_timeout:
                 logger.info(
                     "Timeout for getting filter-setting ack: %s, %s", id(context_filter_ack_queue), required_response
                 )
                 return None
 
-            raise err
-
-        return False
+            raise
 
     def add_context(self, context_queue, filters=None):
         """Register context
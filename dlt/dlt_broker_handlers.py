@@ -190,7 +190,8 @@ class DLTContextHandler(Thread):
             try:
                 if self.message_queue.full():
                     logger.error("message_queue is full ! put() on this queue will block")
-                queue_id, message = self.message_queue.get_nowait()
+                # - wait for the next message instead of polling, the timeout keeps the stop flag responsive
+                queue_id, message = self.message_queue.get(timeout=0.01)
             except Empty:
                 pass
 
@@ -198,8 +199,6 @@ class DLTContextHandler(Thread):
                 queue, _ = self.context_map.get(queue_id, (None, None))
                 if queue:
                     queue.put(message)
-            else:
-                time.sleep(0.01)
 
     def stop(self):
         """Stops thread execution"""
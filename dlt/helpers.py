@@ -60,3 +60,23 @@ def bytes_to_str(byte_or_str):
         return byte_or_str.decode("utf8", errors="replace")
 
     return str(byte_or_str)
+
+
+class cached_property(object):  # pylint: disable=invalid-name
+    """
+    A property that is only computed once per instance and then replaces itself
+    with an ordinary attribute. Deleting the attribute resets the property.
+    Copyright: Marcel Hellkamp <marc@gsites.de>
+    Source: https://github.com/bottlepy/bottle/commit/fa7733e075da0d790d809aa3d2f53071897e6f76
+    Licence: MIT
+    """  # noqa
+
+    def __init__(self, func):
+        self.__doc__ = getattr(func, "__doc__")
+        self.func = func
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        value = obj.__dict__[self.func.__name__] = self.func(obj)
+        return value
@@ -4,7 +4,7 @@
 import unittest
 from unittest.mock import patch, Mock
 
-from dlt.dlt import DLTClient, DLT_RETURN_OK, DLT_RETURN_ERROR
+from dlt.dlt import DLTClient, DLT_RECEIVE_BUFSIZE, DLT_RETURN_OK, DLT_RETURN_ERROR
 
 
 class TestDLTClient(unittest.TestCase):
@@ -25,5 +25,6 @@ class TestDLTClient(unittest.TestCase):
     def test_connect_with_timeout_success(self):
         with patch("socket.create_connection", return_value=Mock(fileno=Mock(return_value=2000000))), patch(
             "dlt.dlt.dltlib.dlt_receiver_init", return_value=DLT_RETURN_OK
-        ):
+        ) as receiver_init:
             self.assertTrue(self.client.connect(timeout=2))
+            self.assertEqual(receiver_init.call_args[0][-1], DLT_RECEIVE_BUFSIZE)
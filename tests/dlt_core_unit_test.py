@@ -2,7 +2,7 @@
 """Basic size tests for ctype wrapper definitions, to protect against regressions"""
 import ctypes
 import importlib
-import os
+import importlib.util
 import unittest
 from unittest.mock import patch, MagicMock
 
@@ -36,6 +36,12 @@ class TestCoreStructures(unittest.TestCase):
                 ),
             )
 
+    def test_overrides_keep_module_identity(self):
+        core = importlib.import_module("dlt.core")
+
+        self.assertEqual(core.__name__, "dlt.core")
+        self.assertEqual(core.__spec__.name, "dlt.core")
+
 
 class TestImportSpecificVersion(unittest.TestCase):
     def setUp(self):
@@ -50,6 +56,7 @@ class TestImportSpecificVersion(unittest.TestCase):
         self.version_truncate_filename = "core_2180.py"
 
         dlt.core.API_VER = None
+        dlt.core._API_FILE_CACHE.clear()
 
     def tearDown(self):
         dlt.core.API_VER = self.original_api_version
@@ -68,19 +75,46 @@ class TestImportSpecificVersion(unittest.TestCase):
         self.assertEqual(api_version, self.version_answer.decode())
         self.assertEqual(dlt.core.API_VER, self.version_answer.decode())
 
+        # - the version is only queried once from the library
+        self.assertEqual(dlt.core.get_version(mock_loaded_lib), self.version_answer.decode())
+        self.assertEqual(mock_loaded_lib.dlt_get_version.call_count, 1)
+
     def test_get_api_specific_file(self):
-        with patch.object(os.path, "exists", return_value=True):
+        with patch.object(importlib.util, "find_spec", return_value=True):
+            filename = dlt.core.get_api_specific_file(self.version_answer.decode())
+            self.assertEqual(filename, self.version_filename)
+
+    def test_get_api_specific_file_version_tuple(self):
+        with patch.object(importlib.util, "find_spec", return_value=True):
+            filename = dlt.core.get_api_specific_file((2, 18, 5))
+            self.assertEqual(filename, self.version_filename)
+
+    def test_get_api_specific_module(self):
+        with patch.object(importlib.util, "find_spec", return_value=True):
+            module_name = dlt.core.get_api_specific_module(self.version_answer.decode())
+            self.assertEqual(module_name, "dlt.core.core_2185")
+
+    def test_get_api_specific_file_cached(self):
+        with patch.object(importlib.util, "find_spec", return_value=True) as mock_find_spec:
+            dlt.core.get_api_specific_file(self.version_answer.decode())
             filename = dlt.core.get_api_specific_file(self.version_answer.decode())
             self.assertEqual(filename, self.version_filename)
+            self.assertEqual(mock_find_spec.call_count, 1)
 
     def test_get_api_specific_file_not_found(self):
-        with patch.object(os.path, "exists", side_effect=[False, False]):
+        with patch.object(importlib.util, "find_spec", side_effect=[None, None]):
             with self.assertRaises(ImportError) as err_cm:
                 dlt.core.get_api_specific_file(self.version_answer.decode())
 
             self.assertEqual(str(err_cm.exception), "No module file: {}".format(self.version_truncate_filename))
 
     def test_get_api_specific_file_truncate_minor_version(self):
-        with patch.object(os.path, "exists", side_effect=[False, True]):
+        with patch.object(importlib.util, "find_spec", side_effect=[None, True]):
             filename = dlt.core.get_api_specific_file(self.version_truncate_str)
             self.assertEqual(filename, self.version_truncate_filename)
+
+    def test_check_libdlt_version(self):
+        dlt.core.check_libdlt_version((2, 18, 10))
+
+        with self.assertRaises(ImportError):
+            dlt.core.check_libdlt_version((2, 18, 4))
@@ -146,3 +146,32 @@ class TestMainLoopByReadingDltFile(unittest.TestCase):
         # Expectation: the received message should have apid==b"" and ctid==b""
         self.assertEqual("", self.message_queue[0].apid)
         self.assertEqual("", self.message_queue[0].ctid)
+
+    def test_007_find_next_header(self):
+        """
+        Simulate a case to find a storage header behind corrupt data, at the border of a 1024 byte block
+        """
+        with open(self.dlt_file_name, "wb") as fobj:
+            fobj.write(b"x" * 1022 + stream_multiple)
+
+        self.assertEqual(self.dlt_reader._find_next_header(), 1022)
+
+        self.dlt_reader.file_position = 1023
+        self.assertEqual(self.dlt_reader._find_next_header(), 1022 + 105)
+
+        self.dlt_reader.file_position = 1022 + len(stream_multiple)
+        self.assertIsNone(self.dlt_reader._find_next_header())
+
+    def test_008_stop_reading_while_waiting_for_data(self):
+        """
+        Simulate a live run which waits for new data and is stopped from another thread
+        """
+        append_stream_to_file(stream_multiple, self.dlt_file_name)
+        self.dlt_reader.poll_interval = 60
+        self._start_main_loop()
+        self.assertEqual(2, len(self.message_queue))
+
+        self.dlt_reader.stop_reading.set()
+        # Expectation: the main loop does not sleep until the poll interval is over
+        self.main_loop.join(1)
+        self.assertFalse(self.main_loop.is_alive())
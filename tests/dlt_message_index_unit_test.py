@@ -0,0 +1,114 @@
+# Copyright (C) 2026. BMW Car IT GmbH. All rights reserved.
+"""Basic unittests for the DLT message index"""
+import os
+import tempfile
+
+import pytest
+
+from dlt.dlt import DLTMessageIndex
+
+from .utils import (
+    file_with_four_lifecycles,
+    stream_multiple,
+    stream_multiple_with_malformed_message_at_begining,
+)
+
+
+class TestsDLTMessageIndex(object):
+    def test_index(self):
+        index = DLTMessageIndex(stream_multiple)
+
+        assert len(index) == 2
+        assert list(index.offsets) == [0, 105]
+        assert list(index.lengths) == [105, 352]
+        assert list(index.htyp) == [0x35, 0x3D]
+        assert index.corrupt_msg_count == 0
+
+    def test_index_storage_headers(self):
+        index = DLTMessageIndex(stream_multiple)
+
+        assert list(index.seconds) == [1473343267, 1473343267]
+        assert list(index.microseconds) == [802372, 802415]
+        assert index.ecu == [b"MGHS", b"MGHS"]
+        assert index.storageheader(1).seconds == 1473343267
+        assert index.storageheader(1).ecu == b"MGHS"
+
+    def test_index_ids(self):
+        index = DLTMessageIndex(stream_multiple_with_malformed_message_at_begining)
+
+        assert index.apid == [b"", b"DA1", b"SYS"]
+        assert index.ctid == [b"", b"DC1", b"JOUR"]
+        assert index.select(apid="SYS") == [2]
+        assert index.select(apid=b"DA1", ctid=b"DC1") == [1]
+        assert index.select(ctid="DC1") == [1]
+        assert index.select(apid="XXX") == []
+        assert index.select() == [0, 1, 2]
+
+    def test_index_filter(self):
+        index = DLTMessageIndex(stream_multiple_with_malformed_message_at_begining)
+
+        # the first message has no extended header and passes every filter
+        assert index.filter([("SYS", "JOUR")]) == [0, 2]
+        assert index.filter([(b"DA1", "")]) == [0, 1]
+        assert index.filter([("", "DC1"), ("SYS", None)]) == [0, 1, 2]
+        assert index.filter([("XXX", "DC1")]) == [0]
+        assert index.filter([]) == [0, 1, 2]
+
+    def test_index_lifecycles(self):
+        index = DLTMessageIndex(file_with_four_lifecycles)
+
+        assert len(index) == 11
+        assert list(index.mcnt) == [1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0]
+
+    def test_index_malformed_message_at_begining(self):
+        index = DLTMessageIndex(stream_multiple_with_malformed_message_at_begining)
+
+        assert len(index) == 3
+        assert list(index.offsets) == [0, 92, 197]
+        assert index[0].message_id == 1279675715
+        assert not index[0].extendedheader
+
+    def test_index_incomplete_message(self):
+        index = DLTMessageIndex(stream_multiple[:-1])
+
+        assert len(index) == 1
+
+    def test_index_corrupt_length(self):
+        corrupt = bytearray(stream_multiple[:105])
+        corrupt[18:20] = b"\xff\xff"  # length of the standard header
+        index = DLTMessageIndex(stream_multiple[:105] + bytes(corrupt) + stream_multiple)
+
+        assert list(index.offsets) == [0, 210, 315]
+        assert index.corrupt_msg_count == 1
+
+    def test_index_skips_garbage(self):
+        index = DLTMessageIndex(b"garbage" + stream_multiple[:105] + b"garbage" + stream_multiple[105:])
+
+        assert list(index.offsets) == [7, 119]
+        assert index.corrupt_msg_count == 2
+
+    def test_getitem(self):
+        index = DLTMessageIndex(stream_multiple)
+
+        assert index[0].apid == "DA1"
+        assert index[-1].apid == "SYS"
+        assert index[-1].ctid == "JOUR"
+        with pytest.raises(IndexError):
+            index[2]
+
+    def test_from_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "test.dlt")
+            with open(filename, "wb") as fobj:
+                fobj.write(stream_multiple)
+
+            with DLTMessageIndex.from_file(filename) as index:
+                assert list(index.offsets) == [0, 105]
+                assert index[1].ctid == "JOUR"
+
+            assert index.data.closed
+
+    def test_from_empty_file(self):
+        with tempfile.NamedTemporaryFile() as fobj:
+            with pytest.raises(IOError):
+                DLTMessageIndex.from_file(fobj.name)
@@ -16,6 +16,7 @@ from tests.utils import (
     stream_multiple_with_malformed_message_at_begining,
     msg_benoit,
     control_one,
+    file_with_four_lifecycles,
 )
 
 
@@ -40,6 +41,12 @@ class TestsDLTMessageUnit(object):
 
         assert msg1 == msg2
 
+    def test_not_equal(self):
+        msgs = create_messages(stream_multiple, from_file=True)
+
+        assert msgs[0] != msgs[1]
+        assert not msgs[1] == create_messages(stream_one)
+
     def test_easy_attributes(self):
         msg = create_messages(stream_one)
 
@@ -58,6 +65,13 @@ class TestsDLTMessageUnit(object):
         assert msg1.compare(dict(apid="DA1", ctid="DC1"))
         assert not msg1.compare(dict(apid="DA1", ctid="XX"))
 
+    def test_matches_any(self):
+        msg = create_messages(stream_one)
+
+        assert msg.matches_any(frozenset([("XX", "YY"), ("DA1", "DC1")]))
+        assert not msg.matches_any(frozenset([("DA1", "XX"), ("XX", "DC1")]))
+        assert not msg.matches_any(frozenset())
+
     def test_compare_regexp(self):
         msg1 = create_messages(stream_one)
 
@@ -141,6 +155,19 @@ class TestsDLTMessageUnit(object):
             assert msg.compare(other)
             assert ecuid.call_count == 2
 
+    def test_id_strings_out_of_range(self):
+        msg = create_messages(stream_one)
+
+        with patch("dlt.dlt.DLTMessage.message_id", new_callable=PropertyMock) as message_id:
+            message_id.return_value = 21
+            assert msg.message_id_string == b""
+
+        with patch("dlt.dlt.DLTMessage.ctrl_return_type", new_callable=PropertyMock) as ctrl_return_type:
+            ctrl_return_type.return_value = 9
+            assert msg.ctrl_return_type_string == b""
+            ctrl_return_type.return_value = 8
+            assert msg.ctrl_return_type_string == b"no_matching_context_id"
+
     def test_pickle_api(self):
         messages = create_messages(stream_multiple, from_file=True)
         for msg in messages:
@@ -195,6 +222,24 @@ class TestsDLTMessageUnit(object):
         assert apid == "MON"
         assert ctid == "CPUS"
 
+    def test_sort_data_without_timestamp(self):
+        # extended header right behind the ecu id, without session id and timestamp
+        data = file_with_four_lifecycles[:43]
+        tmsp, length, apid, ctid = DLTMessage.extract_sort_data(data)
+
+        assert tmsp == 0.0
+        assert length == len(data)
+        assert apid == ""
+        assert ctid == ""
+
+    def test_sort_data_memoryview(self):
+        data = (
+            b"DLT\x011\xd9PYfI\x08\x00MGHS=\x00\x000MGHS\x00\x00\x03\x1e\x00\x00\x94\xc8A"
+            b"\x01MON\x00CPUS\x00\x02\x00\x00\x10\x004 online cores\n\x00"
+        )
+
+        assert DLTMessage.extract_sort_data(memoryview(data)) == DLTMessage.extract_sort_data(data)
+
     def test_largelog(self):
         data = (
             b"DLT\x012\xd9PY)\x00\x01\x00MGHS=o\x02\x04MGHS\x00\x00\x03\x1e\x00\x00\x9e\xb7"
@@ -256,3 +301,35 @@ class TestsControl(object):
             msg.payload_decoded == "[get_log_info 7] get_log_info, 07, 01 00 48 44 44 4d 01 00 43 41 50 49 ff"
             " ff 04 00 43 41 50 49 06 00 68 64 64 6d 67 72 72 65 6d 6f"
         )
+
+    def test_ctrl_service_id_big_endian(self):
+        data = bytearray(control_one)
+        data[16] |= 0x02  # DLT_HTYP_MSBF
+        data[38:42] = b"\x00\x00\x00\x03"
+        msg = create_messages(bytes(data), from_file=True)[0]
+        assert msg.ctrl_service_id == 3
+        assert msg.ctrl_service_id_string == b"get_log_info"
+
+    def test_type_control(self):
+        msg = create_messages(control_one, from_file=True)[0]
+        assert msg.is_type_control
+        assert msg.is_type_control_response
+        assert msg.ctrl_return_type == 7
+
+    def test_log_message_is_not_type_control(self):
+        # - the second message is a verbose log message of SYS/JOUR
+        msg = create_messages(stream_multiple, from_file=True)[1]
+        assert msg.type == 0
+        assert not msg.is_type_control
+        assert not msg.is_type_control_response
+        assert msg.ctrl_service_id == 0
+        assert msg.ctrl_return_type == 0
+
+    def test_non_verbose_log_message_with_extended_header(self):
+        data = bytearray(control_one)
+        data[28:30] = b"\x40\x00"  # non-verbose log info message, no arguments
+        msg = create_messages(bytes(data), from_file=True)[0]
+        assert msg.extendedheader
+        assert not msg.is_type_control
+        assert msg.payload_decoded.startswith("[get_log_info] #")
+        assert msg.payload_decoded.endswith("#")